@@ -1,6 +1,4 @@
 import bpy
-import bmesh
-import math
 from mathutils import Vector
 
 """
@@ -25,6 +23,11 @@ sensor_width_mm = 11.25
 sensor_height_mm = 7.03
 focal_length_mm = 18
 
+# Half frame size per unit of distance in front of the camera,
+# tan(fov / 2) = (sensor / 2) / focal_length (units cancel)
+HALF_WIDTH_PER_UNIT = sensor_width_mm / (2 * focal_length_mm)
+HALF_HEIGHT_PER_UNIT = sensor_height_mm / (2 * focal_length_mm)
+
 def rename_origin(old_name, new_name):
     """Rename an existing origin object"""
     try:
@@ -57,30 +60,25 @@ def create_l_marker(name, location=(0, 0, 0)):
     bpy.context.scene.collection.objects.link(obj)
     obj.location = location
     
-    # Create bmesh
-    bm = bmesh.new()
-    
-    # Vertical line of the L (going down from top-left)
-    v0 = bm.verts.new((0, 0, 0))
-    v1 = bm.verts.new((L_LINE_WIDTH, 0, 0))
-    v2 = bm.verts.new((L_LINE_WIDTH, -L_LINE_LENGTH, 0))
-    v3 = bm.verts.new((0, -L_LINE_LENGTH, 0))
-    
-    # Horizontal line of the L (going right from bottom of vertical)
-    v4 = bm.verts.new((0, -L_LINE_LENGTH, 0))
-    v5 = bm.verts.new((L_LINE_LENGTH, -L_LINE_LENGTH, 0))
-    v6 = bm.verts.new((L_LINE_LENGTH, -L_LINE_LENGTH - L_LINE_WIDTH, 0))
-    v7 = bm.verts.new((0, -L_LINE_LENGTH - L_LINE_WIDTH, 0))
-    
-    # Create faces for vertical part
-    bm.faces.new([v0, v1, v2, v3])
-    
-    # Create faces for horizontal part
-    bm.faces.new([v4, v5, v6, v7])
+    # Vertical line of the L (going down from top-left), then horizontal
+    # line of the L (going right from bottom of vertical). Both faces share the
+    # edge 2-3 at the bottom of the vertical line.
+    verts = [
+        (0, 0, 0),
+        (L_LINE_WIDTH, 0, 0),
+        (L_LINE_WIDTH, -L_LINE_LENGTH, 0),
+        (0, -L_LINE_LENGTH, 0),
+        (L_LINE_LENGTH, -L_LINE_LENGTH, 0),
+        (L_LINE_LENGTH, -L_LINE_LENGTH - L_LINE_WIDTH, 0),
+        (0, -L_LINE_LENGTH - L_LINE_WIDTH, 0),
+    ]
+    faces = [
+        (0, 1, 2, 3),  # Vertical part
+        (3, 2, 4, 5, 6),  # Horizontal part
+    ]
     
     # Update mesh
-    bm.to_mesh(mesh)
-    bm.free()
+    mesh.from_pydata(verts, [], faces)
     mesh.update()
     
     # Add material to make it visible
@@ -103,18 +101,9 @@ def calculate_frame_corner_offset(camera_obj, distance_from_camera=0.1):
     Returns:
         tuple: (x, y, z) position of the top-left frame corner
     """
-    # Camera properties
-    sensor_width = sensor_width_mm / 1000  # Convert to meters
-    sensor_height = sensor_height_mm / 1000
-    focal_length = focal_length_mm / 1000
-    
-    # Calculate FOV
-    fov_x = 2 * math.atan(sensor_width / (2 * focal_length))
-    fov_y = 2 * math.atan(sensor_height / (2 * focal_length))
-    
     # Half-dimensions at the distance plane
-    half_width = distance_from_camera * math.tan(fov_x / 2)
-    half_height = distance_from_camera * math.tan(fov_y / 2)
+    half_width = distance_from_camera * HALF_WIDTH_PER_UNIT
+    half_height = distance_from_camera * HALF_HEIGHT_PER_UNIT
     
     # Top-left corner offset (in camera space: left = -X, up = +Y, forward = -Z)
     left_offset = camera_obj.matrix_world @ Vector((-half_width, half_height, -distance_from_camera))
@@ -1,5 +1,15 @@
 import bpy
-import yaml
+import importlib
+import os
+import sys
+
+# Blender does not put the script directory on sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import render_lib
+
+# Blender caches imported modules between runs, pick up edits to render_lib
+importlib.reload(render_lib)
 
 offset_x = -43.55  
 offset_y = -13.8 
@@ -43,18 +53,15 @@ def set_render_settings(resolution_x, resolution_y, output_path):
     scene.render.pixel_aspect_x = 1
     scene.render.pixel_aspect_y = 1
     scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.compression = 0  # Skip zlib, trade disk for render time
     scene.render.filepath = output_path
 
-# Load cameras from YAML file
-def load_cameras_from_yaml(filepath):
-    with open(filepath, 'r') as file:
-        data = yaml.safe_load(file)
-    return data
-
 # Main execution
 if __name__ == "__main__":
     yaml_path = "C:/Users/Bende/Documents/blender_hangar/cameras_case_D.yaml"
-    cameras = load_cameras_from_yaml(yaml_path)
+    cameras = render_lib.load_cameras_from_yaml(yaml_path)
+    if cameras is None:
+        sys.exit(1)
     
     for cam in cameras['cameras']:
         cam_id = cam['id']
@@ -1,43 +1,50 @@
 import bpy
+import numpy as np
 
 offset_x = -61.5  
 offset_y = -13.6 
 offset_z = 0.0 
 
-# Create a new camera
-def create_camera(name, location, rotation):
-    camera_data = bpy.data.cameras.new(name=name)
-    camera_object = bpy.data.objects.new(name, camera_data)
-    bpy.context.scene.collection.objects.link(camera_object)
-    camera_object.location = (
-        location[0] + offset_x,
-        location[1] + offset_y,
-        location[2] + offset_z,
-    )
-    camera_object.rotation_euler = rotation
-    return camera_object
+# Create new cameras, locations and rotations are (N, 3) arrays
+def create_cameras(names, locations, rotations):
+    # Apply the offset to all locations at once
+    world_locations = np.asarray(locations, dtype=np.float32) + np.array([offset_x, offset_y, offset_z], dtype=np.float32)
+    rotations = np.asarray(rotations, dtype=np.float32)
+    
+    collection = bpy.context.scene.collection
+    camera_objects = []
+    for name, location, rotation in zip(names, world_locations, rotations):
+        camera_data = bpy.data.cameras.new(name=name)
+        camera_object = bpy.data.objects.new(name, camera_data)
+        collection.objects.link(camera_object)
+        camera_object.location = location
+        camera_object.rotation_euler = rotation
+        camera_objects.append(camera_object)
+    return camera_objects
 
 # Set render settings
-def set_render_settings(resolution_x, resolution_y, file_format, output_path):
+def set_render_settings(resolution_x, resolution_y, file_format, output_path, quality=90):
     scene = bpy.context.scene
     scene.render.resolution_x = resolution_x
     scene.render.resolution_y = resolution_y
     scene.render.image_settings.file_format = file_format
+    scene.render.image_settings.quality = quality  # Used by JPEG only
     scene.render.filepath = output_path
 
 # Main execution
 if __name__ == "__main__":
-    # Create and position the camera
-    camera = create_camera("Camera_1", (17.6, 2, 18), (0, 0, 1.5708))
+    # Create and position the cameras
+    cameras = create_cameras(["Camera_1"], [(17.6, 2, 18)], [(0, 0, 1.5708)])
     
-    # Set it as the active camera
-    bpy.context.scene.camera = camera
+    # Set the first one as the active camera
+    bpy.context.scene.camera = cameras[0]
     
     # Use Eevee for faster rendering
     bpy.context.scene.render.engine = 'BLENDER_EEVEE_NEXT'
     
     # Configure render settings
-    set_render_settings(1920, 1080, 'PNG', 'C:/Users/Bende/Documents/render.png')
+    # JPEG decodes much faster than PNG in the stitching step
+    set_render_settings(1920, 1080, 'JPEG', 'C:/Users/Bende/Documents/render.jpg')
     
     # Render the image
     bpy.ops.render.render(write_still=True)
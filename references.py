@@ -1,5 +1,4 @@
 import bpy
-import bmesh
 import math
 
 """
@@ -19,6 +18,7 @@ sensor_width_mm = 11.25
 sensor_height_mm = 7.03
 focal_length_mm = 18
 camera_height = 10.0  # Camera position: 10m above world origin
+CAMERA_ROTATION_DOWN = (math.pi * 0.5, 0.0, 0.0)  # Euler rotation, looking down
 
 def setup_world_origin():
     """Move world origin empty to (0, 0, 0)"""
@@ -33,10 +33,10 @@ def setup_world_origin():
 
 def create_camera_at_world():
     """Create camera at world origin looking down"""
-    # Delete existing cameras first (optional)
-    for obj in bpy.data.objects:
-        if obj.type == 'CAMERA' and "test_camera" in obj.name.lower():
-            bpy.data.objects.remove(obj, do_unlink=True)
+    # Delete existing camera first (optional)
+    existing = bpy.data.objects.get("test_camera")
+    if existing is not None:
+        bpy.data.objects.remove(existing, do_unlink=True)
     
     camera_data = bpy.data.cameras.new("test_camera")
     camera_obj = bpy.data.objects.new("test_camera", camera_data)
@@ -44,7 +44,7 @@ def create_camera_at_world():
     
     # Position camera above world origin, looking down
     camera_obj.location = (0, 0, camera_height)
-    camera_obj.rotation_euler = (math.radians(90), 0, 0)  # Looking down
+    camera_obj.rotation_euler = CAMERA_ROTATION_DOWN
     
     # Camera properties
     camera_data.lens = focal_length_mm
@@ -71,30 +71,25 @@ def create_l_marker_at_frame_corner():
     obj = bpy.data.objects.new("frame_calibration_L", mesh)
     bpy.context.scene.collection.objects.link(obj)
     
-    # Create bmesh for L-shape
-    bm = bmesh.new()
-    
-    # Vertical line of L
-    v0 = bm.verts.new((0, 0, 0))
-    v1 = bm.verts.new((L_LINE_WIDTH, 0, 0))
-    v2 = bm.verts.new((L_LINE_WIDTH, -L_LINE_LENGTH, 0))
-    v3 = bm.verts.new((0, -L_LINE_LENGTH, 0))
-    
-    # Horizontal line of L
-    v4 = bm.verts.new((0, -L_LINE_LENGTH, 0))
-    v5 = bm.verts.new((L_LINE_LENGTH, -L_LINE_LENGTH, 0))
-    v6 = bm.verts.new((L_LINE_LENGTH, -L_LINE_LENGTH - L_LINE_WIDTH, 0))
-    v7 = bm.verts.new((0, -L_LINE_LENGTH - L_LINE_WIDTH, 0))
-    
-    bm.faces.new([v0, v1, v2, v3])
-    bm.faces.new([v4, v5, v6, v7])
-    
-    bm.to_mesh(mesh)
-    bm.free()
+    # Vertical line of L, then horizontal line of L. Both faces share the
+    # edge 2-3 at the bottom of the vertical line, so the L is one connected
+    # surface.
+    verts = [
+        (0, 0, 0),
+        (L_LINE_WIDTH, 0, 0),
+        (L_LINE_WIDTH, -L_LINE_LENGTH, 0),
+        (0, -L_LINE_LENGTH, 0),
+        (L_LINE_LENGTH, -L_LINE_LENGTH, 0),
+        (L_LINE_LENGTH, -L_LINE_LENGTH - L_LINE_WIDTH, 0),
+        (0, -L_LINE_LENGTH - L_LINE_WIDTH, 0),
+    ]
+    faces = [(0, 1, 2, 3), (3, 2, 4, 5, 6)]
+    
+    mesh.from_pydata(verts, [], faces)
     mesh.update()
     
-    # Add red material
-    mat = bpy.data.materials.new("L_marker_material")
+    # Add red material (reuse it if a previous run already created it)
+    mat = bpy.data.materials.get("L_marker_material") or bpy.data.materials.new("L_marker_material")
     mat.diffuse_color = (1.0, 0.0, 0.0, 1.0)  # Red
     obj.data.materials.append(mat)
     
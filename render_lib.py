@@ -0,0 +1,356 @@
+import bpy
+import yaml
+import json
+import os
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from mathutils import Vector
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+"""
+Shared helpers for the camera + rover render scripts
+The top-level scripts only define their rover positions, YAML path and
+output directory, and call into these functions.
+Blender keeps imported modules between script runs, so the scripts reload
+this module on start to pick up edits to the settings below.
+"""
+
+# Set to True to print per-step diagnostics (errors are always printed)
+DEBUG = False
+
+# Camera specifications
+sensor_width_mm = 11.25
+sensor_height_mm = 7.03
+resolution_width_px = 1920
+resolution_height_px = 1200
+pixel_size_um = 5.86
+focal_length_mm = 18
+
+# EEVEE render samples (Blender default is 64)
+TAA_SAMPLES = 16
+
+# Render raw linear output without the AgX/Filmic view transform
+CALIBRATION_MODE = True
+
+# Save PNGs from a background thread while the next frame renders. Needs
+# Pillow, and CALIBRATION_MODE since the pixels are written without a view
+# transform. The frame is read from a compositor Viewer node and saved as
+# 8-bit RGBA, so render_sweep falls back to bpy.ops.render.render(write_still=True)
+# for scenes where that would differ, see async_write_supported.
+ASYNC_WRITE = CALIBRATION_MODE and Image is not None
+PNG_WRITER_THREADS = 2
+
+if DEBUG:
+    def debug_print(message):
+        """Print with clear formatting"""
+        print(f"[DEBUG] {message}")
+else:
+    def debug_print(message):
+        """Debug output disabled, see DEBUG"""
+
+# Scene objects by name, filled by index_scene_objects
+_obj_index = {}
+
+def index_scene_objects():
+    """Index bpy.data.objects by name once, call at script start before any lookups"""
+    _obj_index.clear()
+    _obj_index.update((obj.name, obj) for obj in bpy.data.objects)
+    debug_print(f"✓ Indexed {len(_obj_index)} scene objects")
+
+def verify_object_exists(obj_name):
+    """Check if object exists and print status"""
+    obj = _obj_index.get(obj_name)
+    if obj is None:
+        print(f"✗ ERROR: Object '{obj_name}' NOT FOUND in scene!")
+        print(f"  Available objects: {list(_obj_index)}")
+        return None
+
+    debug_print(f"✓ Object '{obj_name}' found")
+    debug_print(f"  Location: {obj.location}")
+    debug_print(f"  Hidden in viewport: {obj.hide_viewport}")
+    debug_print(f"  Hidden in render: {obj.hide_render}")
+    return obj
+
+def get_origin(origin_name):
+    """Get the location of an origin object"""
+    origin_obj = _obj_index.get(origin_name)
+    if origin_obj is None:
+        print(f"✗ Warning: Origin '{origin_name}' not found. Using (0,0,0)")
+        return Vector((0, 0, 0))
+
+    debug_print(f"✓ Origin '{origin_name}' found at {origin_obj.location}")
+    return origin_obj.location.copy()
+
+def rover_position_arrays(rover_positions, origin_location=Vector((0, 0, 0))):
+    """
+    Convert a list of rover position dicts to arrays
+    Returns (ids, world_locations, rotations), with locations offset by
+    origin_location and indexed like rover_positions.
+    """
+    ids = [pos["id"] for pos in rover_positions]
+    locations = np.array([pos["location"] for pos in rover_positions], dtype=np.float32)
+    rotations = np.array([pos["rotation"] for pos in rover_positions], dtype=np.float32)
+    return ids, locations + np.array(origin_location, dtype=np.float32), rotations
+
+def create_or_update_camera(name, location, rotation):
+    """Create or update camera at specified location and rotation"""
+    # Delete if left over from a previous run
+    existing = bpy.data.objects.get(name)
+    if existing is not None:
+        bpy.data.objects.remove(existing, do_unlink=True)
+
+    camera_data = bpy.data.cameras.new(name=name)
+    camera_obj = bpy.data.objects.new(name, camera_data)
+    bpy.context.scene.collection.objects.link(camera_obj)
+
+    # Set camera properties
+    camera_data.type = 'PERSP'
+    camera_data.lens = focal_length_mm
+    camera_data.sensor_width = sensor_width_mm
+    camera_data.sensor_height = sensor_height_mm
+    camera_data.clip_start = 0.1
+    camera_data.clip_end = 1000
+
+    camera_obj.location = location
+    camera_obj.rotation_euler = rotation
+    debug_print(f"✓ Camera '{name}' created")
+
+    return camera_obj
+
+def move_rover(rover_obj, world_location, rotation):
+    """
+    Move rover to a world location and rotation
+    world_location: already offset by the rover's origin (see rover_position_arrays)
+    Visibility is not touched here, see show_rover.
+    """
+    if rover_obj is None:
+        print(f"✗ ERROR: Rover object is None!")
+        return False
+
+    try:
+        rover_obj.location = world_location
+        rover_obj.rotation_euler = rotation
+
+        return True
+    except Exception as e:
+        print(f"✗ ERROR moving rover: {e}")
+        return False
+
+def show_rover(rover_obj):
+    """Make sure rover is visible for rendering"""
+    rover_obj.hide_render = False
+    rover_obj.hide_viewport = False
+
+def configure_render_engine():
+    """Select EEVEE Next and apply the settings shared by every render"""
+    scene = bpy.context.scene
+    scene.render.engine = 'BLENDER_EEVEE_NEXT'
+    debug_print(f"✓ Render engine set to BLENDER_EEVEE_NEXT")
+
+    # Keep render data between frames, only transforms change between renders
+    scene.render.use_persistent_data = True
+
+    # Calibration renders do not need full anti-aliasing quality, and the UI
+    # does not need to redraw between frames
+    scene.eevee.taa_render_samples = TAA_SAMPLES
+    scene.render.use_lock_interface = True
+    debug_print(f"✓ EEVEE render samples set to {TAA_SAMPLES}")
+
+    if CALIBRATION_MODE:
+        scene.display_settings.display_device = 'sRGB'
+        scene.view_settings.view_transform = 'Raw'
+        debug_print(f"✓ View transform set to Raw")
+
+    init_render_settings(resolution_width_px, resolution_height_px)
+
+def async_write_supported(scene):
+    """
+    True if the Viewer node copy saved by save_png matches what write_still
+    would save: no compositing chain, a single view layer and 8-bit RGBA PNGs
+    """
+    settings = scene.render.image_settings
+    if scene.use_nodes:
+        debug_print(f"✓ Compositing enabled, saving with write_still")
+        return False
+    if settings.color_depth != '8' or settings.color_mode != 'RGBA':
+        debug_print(f"✓ Output is not 8-bit RGBA, saving with write_still")
+        return False
+    if sum(1 for layer in scene.view_layers if layer.use) != 1:
+        debug_print(f"✓ Several view layers, saving with write_still")
+        return False
+    return True
+
+def setup_viewer_node(scene):
+    """
+    Route the render result to a temporary compositor Viewer node so its
+    pixels can be read from Python. Returns the nodes added, pass them to
+    remove_viewer_node when done so the edits are not saved with the .blend.
+    """
+    scene.use_nodes = True
+    tree = scene.node_tree
+
+    added = []
+    layers = next((node for node in tree.nodes if node.type == 'R_LAYERS'), None)
+    if layers is None:
+        layers = tree.nodes.new('CompositorNodeRLayers')
+        added.append(layers)
+    # The active Viewer node is the one that fills the 'Viewer Node' image
+    viewer = tree.nodes.new('CompositorNodeViewer')
+    tree.nodes.active = viewer
+    added.append(viewer)
+
+    tree.links.new(layers.outputs['Image'], viewer.inputs['Image'])
+    debug_print(f"✓ Viewer node connected for background PNG writes")
+    return added
+
+def remove_viewer_node(scene, added):
+    """Undo setup_viewer_node: remove the added nodes (and their links) and turn compositing off again"""
+    for node in added:
+        scene.node_tree.nodes.remove(node)
+    scene.use_nodes = False
+
+def read_viewer_pixels():
+    """Copy the last render from the Viewer node into a (height, width, 4) float32 array"""
+    image = bpy.data.images['Viewer Node']
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+def save_png(output_path, pixels):
+    """Write float RGBA pixels (bottom row first, as Blender stores them) to an 8-bit PNG"""
+    rgba = (np.clip(pixels[::-1], 0.0, 1.0) * 255 + 0.5).astype(np.uint8)
+    Image.fromarray(rgba, 'RGBA').save(output_path, compress_level=0)
+
+def init_render_settings(resolution_x, resolution_y):
+    """Configure render output settings that stay fixed for every render"""
+    scene = bpy.context.scene
+    scene.render.resolution_x = resolution_x
+    scene.render.resolution_y = resolution_y
+    scene.render.pixel_aspect_x = 1
+    scene.render.pixel_aspect_y = 1
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.compression = 0  # Skip zlib, trade disk for render time
+
+    debug_print(f"✓ Render settings configured")
+    debug_print(f"  Resolution: {resolution_x}x{resolution_y}")
+
+def load_cameras_from_yaml(filepath):
+    """Load camera configuration from YAML, reusing a JSON cache when it is up to date"""
+    cache_path = filepath + ".cache.json"
+    try:
+        data = None
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(filepath):
+            try:
+                with open(cache_path, 'r') as file:
+                    data = json.load(file)
+            except (OSError, ValueError) as e:
+                print(f"✗ Warning: ignoring unreadable YAML cache: {e}")
+        if data is None:
+            with open(filepath, 'r') as file:
+                data = yaml.load(file, Loader=CSafeLoader)
+            # Write to a temp file and swap it in, so parallel workers never
+            # read a half-written cache. The cache is best effort: safe YAML
+            # can hold values JSON cannot (dates), those files are just
+            # parsed every run.
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w') as file:
+                    json.dump(data, file)
+                os.replace(tmp_path, cache_path)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"✗ Warning: could not write YAML cache: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        debug_print(f"✓ Loaded {len(data['cameras'])} cameras from YAML")
+        return data
+    except FileNotFoundError:
+        print(f"✗ ERROR: YAML file not found at {filepath}")
+        return None
+    except Exception as e:
+        print(f"✗ ERROR loading YAML: {e}")
+        return None
+
+def render_sweep(cameras, rover_obj, rover_ids, rover_world_locations, rover_rotations,
+                 output_dir, camera_origin=Vector((0, 0, 0))):
+    """
+    Render every YAML camera for every rover position
+    Images are saved as render_<cam_id>_<rover_id>.png in output_dir.
+    Camera locations are offset by camera_origin.
+    Returns the number of images rendered.
+    """
+    render_count = 0
+    scene = bpy.context.scene
+
+    # Save from a background thread only when the Viewer node copy matches
+    # the write_still output, and only for the duration of the sweep
+    viewer_nodes = None
+    if ASYNC_WRITE and async_write_supported(scene):
+        viewer_nodes = setup_viewer_node(scene)
+    writer = ThreadPoolExecutor(max_workers=PNG_WRITER_THREADS) if viewer_nodes is not None else None
+    pending_writes = []
+
+    # Create a single camera once and only move it between YAML entries
+    camera = create_or_update_camera("Camera_active", (0, 0, 0), (0, 0, 0))
+    scene.camera = camera
+
+    show_rover(rover_obj)
+
+    try:
+        # Move the rover in the outer loop so it is repositioned once per rover
+        # position instead of once per camera
+        for i, rover_id in enumerate(rover_ids):
+            debug_print(f"Rover {rover_id} world coords: {rover_world_locations[i]}")
+
+            if not move_rover(rover_obj, rover_world_locations[i], rover_rotations[i]):
+                print("✗ Skipping this rover position")
+                continue
+
+            # Loop through cameras from YAML
+            for cam in cameras['cameras']:
+                cam_id = cam['id']
+
+                print(f"\n--- Render {render_count + 1}: Camera {cam_id} + Rover {rover_id} ---")
+
+                # Move camera
+                camera.location = Vector(cam['location']) + camera_origin
+                camera.rotation_euler = cam['rotation']
+                debug_print(f"✓ Camera {cam_id} at {camera.location}")
+
+                # Configure render output
+                output_path = os.path.join(output_dir, f"render_{cam_id}_{rover_id}.png")
+                bpy.context.scene.render.filepath = output_path
+
+                # Render
+                debug_print(f"Rendering...")
+                try:
+                    if writer is None:
+                        bpy.ops.render.render(write_still=True)
+                        debug_print(f"✓ Saved to {output_path}")
+                    else:
+                        bpy.ops.render.render(write_still=False)
+                        future = writer.submit(save_png, output_path, read_viewer_pixels())
+                        pending_writes.append((output_path, future))
+                    render_count += 1
+                except Exception as e:
+                    print(f"✗ Render failed: {e}")
+    finally:
+        if writer is not None:
+            writer.shutdown(wait=True)
+            remove_viewer_node(scene, viewer_nodes)
+
+    for output_path, future in pending_writes:
+        if future.exception() is not None:
+            print(f"✗ Could not save {output_path}: {future.exception()}")
+            render_count -= 1
+
+    return render_count
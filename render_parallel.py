@@ -0,0 +1,77 @@
+import argparse
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader
+
+"""
+Parallel render driver (run with a regular Python, NOT inside Blender)
+Starts headless Blender instances running render_worker.py, one job per YAML
+camera (or per camera/rover pair with --rover-count), with at most --jobs
+Blender instances running at a time. EEVEE picks its GPU through OpenGL /
+Vulkan and ignores CUDA_VISIBLE_DEVICES, so the instances share one GPU:
+keep --jobs low enough for them to fit in its memory together.
+"""
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_worker.py")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render the YAML camera sweep with parallel Blender instances")
+    parser.add_argument("blend", help="Scene .blend file with the rover, local origin and L-marker")
+    parser.add_argument("yaml", help="Camera configuration YAML")
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of concurrent Blender instances")
+    parser.add_argument("--rover-count", type=int, default=None,
+                        help="Number of rover positions in camera_render_with_rover_2.py; "
+                             "if set, each camera/rover pair is a separate job")
+    parser.add_argument("--output-dir", default=None, help="Render output directory (default: worker default)")
+    return parser.parse_args()
+
+def run_job(args, cam_index, rover_index=None):
+    """Run one render_worker.py job in a headless Blender, return the exit code"""
+    cmd = [args.blender, "-b", args.blend, "--python-exit-code", "1", "-P", WORKER_SCRIPT, "--",
+           "--cam-index", str(cam_index), "--yaml", args.yaml]
+    if rover_index is not None:
+        cmd += ["--rover-index", str(rover_index)]
+    if args.output_dir is not None:
+        cmd += ["--output-dir", args.output_dir]
+
+    # Keep the worker output and show it only for failed jobs, printed in
+    # one call so output from parallel jobs does not interleave
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='replace')
+    status = "✓" if result.returncode == 0 else "✗"
+    message = (f"{status} Camera index {cam_index}" +
+               (f", rover index {rover_index}" if rover_index is not None else ""))
+    if result.returncode != 0:
+        message += f" (exit code {result.returncode}), worker output:\n{result.stdout}"
+    print(message)
+    return result.returncode
+
+# Main execution
+if __name__ == "__main__":
+    args = parse_args()
+
+    with open(args.yaml, 'r') as file:
+        num_cameras = len(yaml.load(file, Loader=CSafeLoader)['cameras'])
+
+    if args.rover_count is None:
+        jobs = [(cam_index, None) for cam_index in range(num_cameras)]
+    else:
+        jobs = [(cam_index, rover_index)
+                for cam_index in range(num_cameras)
+                for rover_index in range(args.rover_count)]
+
+    print(f"Rendering {len(jobs)} jobs, {args.jobs} at a time...")
+
+    # Threads are enough here: each job waits on its own Blender process
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        codes = list(executor.map(lambda job: run_job(args, *job), jobs))
+
+    failed = sum(1 for code in codes if code != 0)
+    print(f"RENDERING COMPLETE: {len(jobs) - failed}/{len(jobs)} jobs succeeded")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,88 @@
+import bpy
+import argparse
+import os
+import sys
+
+"""
+Single-camera render worker for parallel rendering
+Run inside a headless Blender instance (see render_parallel.py):
+    blender -b scene.blend -P render_worker.py -- --cam-index 3 [--rover-index 1]
+Renders one YAML camera with one rover position, or with every rover
+position when --rover-index is omitted.
+"""
+
+# Blender does not put the script directory on sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import render_lib
+import camera_render_with_rover_2 as rover_render
+
+def parse_args():
+    """Parse the arguments passed after '--' on the Blender command line"""
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Render one camera of the YAML sweep")
+    parser.add_argument("--cam-index", type=int, required=True, help="Index into the YAML camera list")
+    parser.add_argument("--rover-index", type=int, default=None, help="Index into rover_positions (default: all)")
+    parser.add_argument("--yaml", default=rover_render.YAML_PATH, help="Camera configuration YAML")
+    parser.add_argument("--output-dir", default=rover_render.OUTPUT_DIR, help="Render output directory")
+    return parser.parse_args(argv)
+
+# Main execution
+if __name__ == "__main__":
+    args = parse_args()
+
+    render_lib.index_scene_objects()
+    local_obj = render_lib.verify_object_exists(rover_render.LOCAL_ORIGIN_NAME)
+    rover_obj = render_lib.verify_object_exists(rover_render.rover_name)
+    cameras = render_lib.load_cameras_from_yaml(args.yaml)
+
+    if local_obj is None or rover_obj is None or cameras is None:
+        print("✗ STOP: Required objects or cameras missing")
+        sys.exit(1)
+
+    num_cameras = len(cameras['cameras'])
+    if not 0 <= args.cam_index < num_cameras:
+        print(f"✗ STOP: --cam-index {args.cam_index} out of range, the YAML has {num_cameras} cameras")
+        sys.exit(1)
+
+    cam = cameras['cameras'][args.cam_index]
+    cam_id = cam['id']
+
+    rover_ids, rover_world_locations, rover_rotations = render_lib.rover_position_arrays(
+        rover_render.rover_positions, local_obj.location)
+
+    if args.rover_index is None:
+        rover_indices = range(len(rover_ids))
+    elif 0 <= args.rover_index < len(rover_ids):
+        rover_indices = [args.rover_index]
+    else:
+        print(f"✗ STOP: --rover-index {args.rover_index} out of range, "
+              f"camera_render_with_rover_2.py defines {len(rover_ids)} rover positions")
+        sys.exit(1)
+
+    render_lib.configure_render_engine()
+
+    camera = render_lib.create_or_update_camera("Camera_active", cam['location'], cam['rotation'])
+    bpy.context.scene.camera = camera
+
+    render_lib.show_rover(rover_obj)
+
+    failed = 0
+    for i in rover_indices:
+        rover_id = rover_ids[i]
+
+        if not render_lib.move_rover(rover_obj, rover_world_locations[i], rover_rotations[i]):
+            failed += 1
+            continue
+
+        output_path = os.path.join(args.output_dir, f"render_{cam_id}_{rover_id}.png")
+        bpy.context.scene.render.filepath = output_path
+
+        try:
+            bpy.ops.render.render(write_still=True)
+            print(f"✓ Camera {cam_id} + Rover {rover_id} saved to {output_path}")
+        except Exception as e:
+            print(f"✗ Render failed for Camera {cam_id} + Rover {rover_id}: {e}")
+            failed += 1
+
+    sys.exit(1 if failed else 0)
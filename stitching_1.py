@@ -1,34 +1,178 @@
+import argparse
 import cv2
+import copyreg
+import os
+import pickle
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+# Optional decoders. Besides ImportError, TurboJPEG() raises RuntimeError and
+# import pyvips raises OSError when the native library is not installed.
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    jpeg = None
+try:
+    import pyvips
+except (ImportError, OSError, RuntimeError):
+    pyvips = None
 
-# Load images
-img1 = cv2.imread('C:/Users/Bende/Documents/blender_hangar/case_A/render_5.png')
-img2 = cv2.imread('C:/Users/Bende/Documents/blender_hangar/case_A/render_1.png')
+# Features are detected on images downscaled by this factor, the homography
+# is then lifted back to full resolution for the warp
+DETECT_SCALE = 0.5
+
+# ORB detector settings, also part of the feature cache key
+ORB_PARAMS = dict(nfeatures=4000, scaleFactor=1.2, nlevels=8, scoreType=cv2.ORB_HARRIS_SCORE)
+
+# Pickle cv2.KeyPoint as its constructor arguments
+copyreg.pickle(cv2.KeyPoint, lambda kp: (cv2.KeyPoint, (kp.pt[0], kp.pt[1], kp.size, kp.angle,
+                                                        kp.response, kp.octave, kp.class_id)))
+
+def use_cuda():
+    """True if OpenCV was built with CUDA and a device is available"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+def warp_perspective(image, M, dsize, flags=cv2.INTER_LINEAR):
+    """cv2.warpPerspective on the GPU: CUDA if available, otherwise OpenCL through UMat"""
+    border_mode = cv2.BORDER_CONSTANT
+    if use_cuda():
+        gpu_image = cv2.cuda_GpuMat()
+        gpu_image.upload(image)
+        return cv2.cuda.warpPerspective(gpu_image, M, dsize, flags=flags, borderMode=border_mode).download()
+    # The T-API runs on OpenCL when available and falls back to the CPU
+    return cv2.warpPerspective(cv2.UMat(image), M, dsize, flags=flags, borderMode=border_mode).get()
+
+def detect_and_compute(orb, path, image):
+    """
+    orb.detectAndCompute with the result cached in <path>.features.pkl
+    The cache is reused while the image file (mtime, size) and the detection
+    settings are unchanged. image must be the rotated, downscaled copy of path.
+    """
+    cache_path = path + ".features.pkl"
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size, DETECT_SCALE, tuple(sorted(ORB_PARAMS.items())))
+    try:
+        with open(cache_path, 'rb') as file:
+            cached_key, keypoints, descriptors = pickle.load(file)
+        if cached_key == key:
+            return keypoints, descriptors
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    keypoints, descriptors = orb.detectAndCompute(image, None)
+    try:
+        with open(cache_path, 'wb') as file:
+            pickle.dump((key, keypoints, descriptors), file, protocol=5)
+    except OSError as e:
+        print(f"Warning: could not write feature cache: {e}")
+    return keypoints, descriptors
+
+# cv2.imread flags that decode directly to grayscale at a reduced scale
+REDUCED_READ_FLAGS = {
+    0.5: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    0.25: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    0.125: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+def reduced_read_flag(path):
+    """
+    cv2.imread flag that decodes path straight to a DETECT_SCALE grayscale
+    copy, or None. Only JPEG decodes faster at reduced size, other formats
+    are decoded in full anyway, see detection_image.
+    """
+    if not path.lower().endswith(('.jpg', '.jpeg')):
+        return None
+    return REDUCED_READ_FLAGS.get(DETECT_SCALE)
+
+def detection_image(image):
+    """Downscale an already decoded BGR image to a DETECT_SCALE grayscale copy for feature detection"""
+    small = cv2.resize(image, None, fx=DETECT_SCALE, fy=DETECT_SCALE, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+def load_image(path):
+    """Decode an image to a BGR array, using TurboJPEG or pyvips when installed"""
+    if jpeg is not None and path.lower().endswith(('.jpg', '.jpeg')):
+        with open(path, 'rb') as file:
+            return jpeg.decode(file.read(), pixel_format=TJPF_BGR)
+    if pyvips is not None:
+        image = pyvips.Image.new_from_file(path, access='sequential')
+        # Match cv2.imread: 8 bits per channel (16-bit renders keep the high
+        # byte) and no alpha. Other sample formats are left to OpenCV.
+        if image.format == 'ushort':
+            image = image.cast('uchar', shift=True)
+        if image.format == 'uchar':
+            if image.bands in (2, 4):
+                image = image.extract_band(0, n=image.bands - 1)
+            image = image.numpy()
+            if image.ndim == 2:
+                return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    return cv2.imread(path)
+
+parser = argparse.ArgumentParser(description="Stitch two renders into a panorama")
+parser.add_argument('--show', action='store_true', help="Display the result in a window")
+args = parser.parse_args()
+
+# Load images (decoded in parallel, the decoders release the GIL). JPEG
+# detection copies are decoded directly at DETECT_SCALE, other formats are
+# downscaled from the full image instead of being decoded twice.
+path1 = 'C:/Users/Bende/Documents/blender_hangar/case_A/render_5.png'
+path2 = 'C:/Users/Bende/Documents/blender_hangar/case_A/render_1.png'
+with ThreadPoolExecutor(max_workers=4) as executor:
+    full_images = executor.map(load_image, [path1, path2])
+    reduced_reads = {path: executor.submit(cv2.imread, path, reduced_read_flag(path))
+                     for path in (path1, path2) if reduced_read_flag(path) is not None}
+    img1, img2 = full_images
+    small1, small2 = (reduced_reads[path].result() if path in reduced_reads else detection_image(image)
+                      for path, image in ((path1, img1), (path2, img2)))
 
 # Rotate 90 degrees clockwise
 img1 = cv2.rotate(img1, cv2.ROTATE_90_CLOCKWISE)
 img2 = cv2.rotate(img2, cv2.ROTATE_90_CLOCKWISE)
+small1 = cv2.rotate(small1, cv2.ROTATE_90_CLOCKWISE)
+small2 = cv2.rotate(small2, cv2.ROTATE_90_CLOCKWISE)
+
+# Detect features and compute binary ORB descriptors on the grayscale copies
+orb = cv2.ORB_create(**ORB_PARAMS)
+kp1, des1 = detect_and_compute(orb, path1, small1)
+kp2, des2 = detect_and_compute(orb, path2, small2)
 
-# Detect features and compute descriptors
-sift = cv2.SIFT_create()
-kp1, des1 = sift.detectAndCompute(img1, None)
-kp2, des2 = sift.detectAndCompute(img2, None)
+# Match features using FLANN with an LSH index for binary ORB descriptors
+FLANN_INDEX_LSH = 6
+index_params = dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1)
+search_params = dict(checks=50)
+flann = cv2.FlannBasedMatcher(index_params, search_params)
+matches = flann.knnMatch(des1, des2, k=2)
 
-# Match features using BFMatcher
-bf = cv2.BFMatcher()
-matches = bf.knnMatch(des1, des2, k=2)
+# Pull match distances and indices into arrays (knnMatch can return fewer
+# than 2 neighbours for a descriptor, those cannot pass the ratio test)
+pairs = [pair for pair in matches if len(pair) == 2]
+distances = np.fromiter((m.distance for pair in pairs for m in pair), dtype=np.float32, count=2 * len(pairs)).reshape(-1, 2)
+query_idx = np.fromiter((pair[0].queryIdx for pair in pairs), dtype=np.int32, count=len(pairs))
+train_idx = np.fromiter((pair[0].trainIdx for pair in pairs), dtype=np.int32, count=len(pairs))
 
 # Apply ratio test to filter good matches
-good_matches = [m for m, n in matches if m.distance < 0.75 * n.distance]
+good = distances[:, 0] < 0.75 * distances[:, 1]
 
 # Check if there are enough matches
-if len(good_matches) > 10:
-    # Extract matched points
-    src_pts = np.float32([kp1[m.queryIdx].pt for m in good_matches]).reshape(-1, 1, 2)
-    dst_pts = np.float32([kp2[m.trainIdx].pt for m in good_matches]).reshape(-1, 1, 2)
+if np.count_nonzero(good) > 10:
+    # Extract matched points: convert all keypoints to (N, 2) arrays once,
+    # then gather the matched rows by index
+    pts1 = cv2.KeyPoint_convert(kp1)
+    pts2 = cv2.KeyPoint_convert(kp2)
+    src_pts = pts1[query_idx[good]].reshape(-1, 1, 2)
+    dst_pts = pts2[train_idx[good]].reshape(-1, 1, 2)
 
-    # Compute homography matrix
-    H, _ = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
+    # Compute homography matrix on the downscaled images and lift it back to
+    # full resolution: H = S^-1 @ H_small @ S. MAGSAC rejects degenerate
+    # samples early; the threshold is 5 px at full resolution.
+    H_small, _ = cv2.findHomography(src_pts, dst_pts, cv2.USAC_MAGSAC, 5.0 * DETECT_SCALE,
+                                    maxIters=2000, confidence=0.999)
+    S = np.diag([DETECT_SCALE, DETECT_SCALE, 1.0])
+    H = np.linalg.inv(S) @ H_small @ S
 
     # Determine the size of the resulting panorama
     height1, width1 = img1.shape[:2]
@@ -43,26 +187,49 @@ if len(good_matches) > 10:
 
     # Combine corners from both images to determine the size of the panorama
     all_corners = np.concatenate((transformed_corners1, corners2), axis=0)
-    [x_min, y_min] = np.int32(all_corners.min(axis=0).ravel())
-    [x_max, y_max] = np.int32(all_corners.max(axis=0).ravel())
+    # Round outwards: np.int32() truncates toward zero, which is wrong for a
+    # negative x_min / y_min
+    x_min, y_min = np.floor(all_corners.min(axis=(0, 1))).astype(np.int32)
+    x_max, y_max = np.ceil(all_corners.max(axis=(0, 1))).astype(np.int32)
 
-    # Translation matrix to handle negative coordinates
+    # Translation matrix to handle negative coordinates, fused into the
+    # homography once and cast to the float32 the warp uses internally
     translation_dist = [-x_min, -y_min]
     H_translation = np.array([[1, 0, translation_dist[0]],
                               [0, 1, translation_dist[1]],
-                              [0, 0, 1]])
+                              [0, 0, 1]], dtype=np.float64)
+    H_full = (H_translation @ H).astype(np.float32)
 
-    # Warp img1 to panorama space
-    result = cv2.warpPerspective(img1, H_translation @ H, (x_max - x_min, y_max - y_min))
+    # Warp img1 to panorama space, along with a mask of its footprint (black
+    # pixels inside img1 are still valid, so the mask cannot come from result)
+    panorama_size = (x_max - x_min, y_max - y_min)
+    result = warp_perspective(img1, H_full, panorama_size)
+    mask1 = warp_perspective(np.full(img1.shape[:2], 255, np.uint8), H_full, panorama_size,
+                             flags=cv2.INTER_NEAREST)
 
-    # Paste img2 into the panorama
-    result[translation_dist[1]:translation_dist[1] + height2, 
-           translation_dist[0]:translation_dist[0] + width2] = img2
+    # Blend img2 into the panorama. Only img2's footprint is touched: outside
+    # the overlap with warped img1 it is copied as is, inside the overlap the
+    # two images are feathered by their distance to their own borders.
+    roi = result[translation_dist[1]:translation_dist[1] + height2,
+                 translation_dist[0]:translation_dist[0] + width2]
+    mask_roi = mask1[translation_dist[1]:translation_dist[1] + height2,
+                     translation_dist[0]:translation_dist[0] + width2]
+    warped_valid = (mask_roi > 0).astype(np.uint8)
+    if not warped_valid.any():
+        roi[:] = img2
+    else:
+        img2_valid = np.zeros((height2 + 2, width2 + 2), np.uint8)
+        img2_valid[1:-1, 1:-1] = 1
+        dist2 = cv2.distanceTransform(img2_valid, cv2.DIST_L2, 3)[1:-1, 1:-1]
+        dist1 = cv2.distanceTransform(warped_valid, cv2.DIST_L2, 3)
+        alpha = (dist2 / (dist1 + dist2))[..., None]  # 1 where img1 is absent
+        roi[:] = (alpha * img2 + (1 - alpha) * roi + 0.5).astype(np.uint8)
 
     # Save and display result
     cv2.imwrite('stitched_image.png', result)
-    # cv2.imshow('Stitched Image', result)
-    cv2.waitKey(0)
-    cv2.destroyAllWindows()
+    if args.show:
+        cv2.imshow('Stitched Image', result)
+        cv2.waitKey(0)
+        cv2.destroyAllWindows()
 else:
     print("Not enough good matches found!")